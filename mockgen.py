@@ -1,28 +1,48 @@
 import uuid
-import random
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 import os
+import multiprocessing
 from faker import Faker
 
-class Player:
-    def __init__(self, mobile, last_name, other_names, promotional_consent):
-        self.mobile = mobile
-        self.last_name = last_name
-        self.other_names = other_names
-        self.promotional_consent = promotional_consent
-        self.category = self.assign_category()
-        
-    def assign_category(self):
-        rand = random.random()
-        if rand < 0.2:  # 20% Highly Loyal
-            return "HIGHLY_LOYAL"
-        elif rand < 0.5:  # 30% Moderately Loyal
-            return "MODERATELY_LOYAL"
-        elif rand < 0.8:  # 30% Occasional
-            return "OCCASIONAL"
-        else:  # 20% Inactive
-            return "INACTIVE"
+# Probability of playing a draw, by player category and draw type
+PARTICIPATION_RATES = {
+    "afternoon": {"HIGHLY_LOYAL": 0.90, "MODERATELY_LOYAL": 0.65, "OCCASIONAL": 0.20},
+    "evening": {"HIGHLY_LOYAL": 0.95, "MODERATELY_LOYAL": 0.75, "OCCASIONAL": 0.25}
+}
+
+# Inclusive range of tickets bought per draw, by player category
+TICKET_RANGES = {
+    "HIGHLY_LOYAL": (3, 5),
+    "MODERATELY_LOYAL": (2, 3),
+    "OCCASIONAL": (1, 2)
+}
+
+def assign_categories(num_players):
+    """Assign a loyalty category to each player"""
+    rand = np.random.random(num_players)
+    return np.select(
+        [
+            rand < 0.2,  # 20% Highly Loyal
+            rand < 0.5,  # 30% Moderately Loyal
+            rand < 0.8   # 30% Occasional
+        ],
+        ["HIGHLY_LOYAL", "MODERATELY_LOYAL", "OCCASIONAL"],
+        default="INACTIVE"  # 20% Inactive
+    )
+
+GHANAIAN_LAST_NAMES = np.array([
+    'Mensah', 'Osei', 'Owusu', 'Addo', 'Boateng', 'Adjei', 
+    'Amankwah', 'Kumah', 'Yeboah', 'Asante', 'Nkrumah', 'Annan',
+    'Asamoah', 'Appiah', 'Kufuor', 'Agyeman', 'Baffour', 'Danso'
+])
+
+GHANAIAN_OTHER_NAMES = np.array([
+    'Kwame', 'Kwesi', 'Kojo', 'Kwabena', 'Yaw', 'Kofi',
+    'Ama', 'Abena', 'Akua', 'Yaa', 'Afua', 'Afia',
+    'Emmanuel', 'Elizabeth', 'Grace', 'Samuel', 'Daniel', 'Mary'
+])
 
 class DailyDraws:
     def __init__(self, date):
@@ -38,17 +58,20 @@ class DailyDraws:
 class TicketGenerator:
     def __init__(self):
         self.prefix = "787"
-        self.suffixes = list('ABCDEFGHIJKLMNOPQRSTUVWXYZ')
+        self.suffixes = np.array(list('ABCDEFGHIJKLMNOPQRSTUVWXYZ'))
 
     def generate_ticket_number(self):
-        random_numbers = ''.join([str(random.randint(0, 9)) for _ in range(9)])
-        suffix = random.choice(self.suffixes)
-        return f"{self.prefix}-{random_numbers}{suffix}"
+        return str(self.generate_ticket_numbers(1)[0])
+
+    def generate_ticket_numbers(self, count):
+        """Generate a batch of ticket numbers as a NumPy string array"""
+        random_numbers = np.char.mod('%09d', np.random.randint(0, 10**9, size=count))
+        suffixes = self.suffixes[np.random.randint(0, len(self.suffixes), size=count)]
+        return np.char.add(np.char.add(f"{self.prefix}-", random_numbers), suffixes)
 
 class DataGenerator:
     def __init__(self, num_players=1000, output_dir="daily_files"):
-        self.fake = Faker()
-        self.players = self.generate_players(num_players)
+        self.generate_players(num_players)
         self.ticket_generator = TicketGenerator()
         self.output_dir = output_dir
         
@@ -57,118 +80,108 @@ class DataGenerator:
             os.makedirs(output_dir)
         
     def generate_players(self, num_players):
-        players = []
+        """Generate player attributes as one column array per field"""
+        fake = Faker()
         Faker.seed(12345)  # For reproducible results
-        
-        for _ in range(num_players):
-            # Generate Ghanaian-style names using Faker
-            if random.random() < 0.7:  # 70% chance of Ghanaian name
-                last_name = random.choice([
-                    'Mensah', 'Osei', 'Owusu', 'Addo', 'Boateng', 'Adjei', 
-                    'Amankwah', 'Kumah', 'Yeboah', 'Asante', 'Nkrumah', 'Annan',
-                    'Asamoah', 'Appiah', 'Kufuor', 'Agyeman', 'Baffour', 'Danso'
-                ])
-                other_names = random.choice([
-                    'Kwame', 'Kwesi', 'Kojo', 'Kwabena', 'Yaw', 'Kofi',
-                    'Ama', 'Abena', 'Akua', 'Yaa', 'Afua', 'Afia',
-                    'Emmanuel', 'Elizabeth', 'Grace', 'Samuel', 'Daniel', 'Mary'
-                ])
-            else:
-                # Non-Ghanaian names for diversity
-                last_name = self.fake.last_name()
-                other_names = self.fake.first_name()
-            
-            mobile = f"233{random.randint(200000000, 599999999)}"
-            player = Player(
-                mobile=mobile,
-                last_name=last_name,
-                other_names=other_names,
-                promotional_consent=random.choice(['Y', 'N'])
-            )
-            players.append(player)
-        return players
-
-    def generate_tickets_for_draw(self, player, draw_id, base_time):
-        tickets = []
-        if player.category == "INACTIVE":
-            return tickets
 
-        # Number of tickets based on player category
-        num_tickets = {
-            "HIGHLY_LOYAL": random.randint(3, 5),
-            "MODERATELY_LOYAL": random.randint(2, 3),
-            "OCCASIONAL": random.randint(1, 2)
-        }.get(player.category, 0)
+        # Generate Ghanaian-style names, with Faker names for diversity
+        is_ghanaian = np.random.random(num_players) < 0.7  # 70% chance of Ghanaian name
+        num_foreign = int((~is_ghanaian).sum())
 
-        # Spread tickets within 2 hours before draw time
-        for _ in range(num_tickets):
-            minutes_before = random.randint(0, 120)  # Up to 2 hours before draw
-            timestamp = base_time - timedelta(minutes=minutes_before)
-            
-            tickets.append({
-                "PLAYER_MOBILE": player.mobile,
-                "DRAW_ID": draw_id,
-                "PLAYER_NAME": f"{player.last_name} {player.other_names}",
-                "TICKET": self.ticket_generator.generate_ticket_number(),
-                "PRICE": "GHS 3.00",
-                "CREATED": timestamp.strftime("%d/%m/%Y %H:%M")
-            })
-        return tickets
-
-    def should_player_participate(self, player, draw_type):
+        last_names = GHANAIAN_LAST_NAMES[
+            np.random.randint(0, len(GHANAIAN_LAST_NAMES), size=num_players)
+        ].astype(object)
+        other_names = GHANAIAN_OTHER_NAMES[
+            np.random.randint(0, len(GHANAIAN_OTHER_NAMES), size=num_players)
+        ].astype(object)
+        last_names[~is_ghanaian] = [fake.last_name() for _ in range(num_foreign)]
+        other_names[~is_ghanaian] = [fake.first_name() for _ in range(num_foreign)]
+
+        self.player_last_names = last_names.astype(str)
+        self.player_other_names = other_names.astype(str)
+        self.player_names = np.char.add(
+            np.char.add(self.player_last_names, " "), self.player_other_names
+        )
+        self.player_mobiles = np.char.add(
+            "233", np.random.randint(200000000, 600000000, size=num_players).astype(str)
+        )
+        self.player_consents = np.random.choice(['Y', 'N'], size=num_players)
+        self.player_categories = assign_categories(num_players)
+
+    def generate_ticket_counts(self, draw_type):
+        """Number of tickets each player buys for one draw (0 if not playing)"""
         # Different participation rates for afternoon vs evening draws
-        if player.category == "HIGHLY_LOYAL":
-            return random.random() < (0.95 if draw_type == "evening" else 0.90)
-        elif player.category == "MODERATELY_LOYAL":
-            return random.random() < (0.75 if draw_type == "evening" else 0.65)
-        elif player.category == "OCCASIONAL":
-            return random.random() < (0.25 if draw_type == "evening" else 0.20)
-        return False
+        rates = PARTICIPATION_RATES[draw_type]
+        participation_prob = np.zeros(len(self.player_categories))
+        min_tickets = np.zeros(len(self.player_categories), dtype=int)
+        max_tickets = np.zeros(len(self.player_categories), dtype=int)
+        for category, rate in rates.items():
+            in_category = self.player_categories == category
+            participation_prob[in_category] = rate
+            min_tickets[in_category], max_tickets[in_category] = TICKET_RANGES[category]
+
+        participates = np.random.random(len(participation_prob)) < participation_prob
+
+        # Number of tickets based on player category
+        num_tickets = np.random.randint(min_tickets, max_tickets + 1)
+        return np.where(participates, num_tickets, 0)
 
     def generate_daily_file(self, date):
         """Generate a single day's worth of ticket data"""
         daily_draws = DailyDraws(date)
-        daily_tickets = []
-        
-        # Generate tickets for afternoon draw
-        for player in self.players:
-            if self.should_player_participate(player, "afternoon"):
-                tickets = self.generate_tickets_for_draw(
-                    player, 
-                    daily_draws.afternoon_draw,
-                    daily_draws.afternoon_time
-                )
-                daily_tickets.extend(tickets)
-        
-        # Generate tickets for evening draw
-        for player in self.players:
-            if self.should_player_participate(player, "evening"):
-                tickets = self.generate_tickets_for_draw(
-                    player,
-                    daily_draws.evening_draw,
-                    daily_draws.evening_time
-                )
-                daily_tickets.extend(tickets)
+        draw_ids = [daily_draws.afternoon_draw, daily_draws.evening_draw]
+        draw_times = np.array(
+            [daily_draws.afternoon_time, daily_draws.evening_time], dtype='datetime64[m]'
+        )
+
+        # Tickets per player for both draws, afternoon block first
+        num_tickets = np.concatenate([
+            self.generate_ticket_counts("afternoon"),
+            self.generate_ticket_counts("evening")
+        ])
+        tickets_per_draw = num_tickets.reshape(2, -1).sum(axis=1)
+        total_tickets = int(tickets_per_draw.sum())
+
+        # Spread tickets within 2 hours before draw time
+        minutes_before = np.random.randint(0, 121, size=total_tickets).astype('timedelta64[m]')
+        timestamps = np.repeat(draw_times, tickets_per_draw) - minutes_before
+
+        # Every column is sized to total_tickets up front
+        df = pd.DataFrame({
+            "PLAYER_MOBILE": np.repeat(np.tile(self.player_mobiles, 2), num_tickets),
+            "DRAW_ID": np.repeat(draw_ids, tickets_per_draw),
+            "PLAYER_NAME": np.repeat(np.tile(self.player_names, 2), num_tickets),
+            "TICKET": self.ticket_generator.generate_ticket_numbers(total_tickets),
+            "PRICE": "GHS 3.00",
+            "CREATED": pd.DatetimeIndex(timestamps).strftime("%d/%m/%Y %H:%M")
+        })
         
-        # Create and save daily DataFrame
-        if daily_tickets:
-            df = pd.DataFrame(daily_tickets)
+        # Save daily DataFrame
+        if not df.empty:
             filename = f"tickets_{date.strftime('%Y%m%d')}.csv"
             filepath = os.path.join(self.output_dir, filename)
             df.to_csv(filepath, index=False)
-            print(f"Generated {filepath} with {len(daily_tickets)} tickets")
+            print(f"Generated {filepath} with {len(df)} tickets")
             return df
         return None
 
-    def generate_historical_data(self, num_days=60):
+    def _generate_seeded_daily_file(self, date_and_seed):
+        """Pool worker: reseed NumPy so forked workers don't repeat each other"""
+        date, seed = date_and_seed
+        np.random.seed(seed)
+        self.generate_daily_file(date)
+
+    def generate_historical_data(self, num_days=60, processes=None):
         """Generate daily files for the specified number of past days"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=num_days)
         
-        current_date = start_date
-        while current_date <= end_date:
-            self.generate_daily_file(current_date)
-            current_date += timedelta(days=1)
+        dates = [start_date + timedelta(days=i) for i in range(num_days + 1)]
+        seeds = np.random.randint(0, 2**32, size=len(dates), dtype=np.uint64)
+        
+        # Days are independent files, so generate them in parallel
+        with multiprocessing.Pool(processes) as pool:
+            pool.map(self._generate_seeded_daily_file, zip(dates, seeds))
 
 # Usage example:
 if __name__ == "__main__":
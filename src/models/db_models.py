@@ -1,6 +1,6 @@
 # src/models/db_models.py
 
-from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, create_engine
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Index, Text, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from datetime import datetime
@@ -21,6 +21,10 @@ class Player(Base):
 
 class PlayerMetrics(Base):
     __tablename__ = 'player_metrics'
+    __table_args__ = (
+        # One metrics row per player per draw; also serves lookups by mobile alone
+        Index('ix_metrics_mobile_draw', 'mobile', 'draw_number', unique=True),
+    )
     
     id = Column(Integer, primary_key=True)
     mobile = Column(String, ForeignKey('players.mobile'))
@@ -32,4 +36,17 @@ class PlayerMetrics(Base):
     updated_at = Column(DateTime, default=datetime.utcnow)
     
     # Relationship
-    player = relationship("Player", back_populates="metrics")
\ No newline at end of file
+    player = relationship("Player", back_populates="metrics")
+
+class ProcessorState(Base):
+    __tablename__ = 'processor_state'
+    
+    key = Column(String, primary_key=True)
+    value = Column(Text, nullable=False)  # JSON-encoded
+
+class PlayerDraw(Base):
+    __tablename__ = 'player_draws'
+    
+    mobile = Column(String, primary_key=True)
+    draw_number = Column(Integer, primary_key=True)
+    tickets = Column(Integer, nullable=False)
\ No newline at end of file
@@ -65,7 +65,8 @@ class LotteryFileHandler(FileSystemEventHandler):
         try:
             # Step 1: Validate file
             logging.info("Step 1: Starting file validation...")
-            validation_result = self.validator.validate_file(str(file_path))
+            # The processor reads the file itself, so don't keep the rows
+            validation_result = self.validator.validate_file(str(file_path), return_data=False)
             
             if not validation_result.is_valid:
                 logging.error("Validation Failed!")
@@ -77,7 +78,7 @@ class LotteryFileHandler(FileSystemEventHandler):
                 return False
             
             logging.info("Validation Successful!")
-            logging.info(f"Found {len(validation_result.data)} records in file")
+            logging.info(f"Found {validation_result.num_records} records in file")
                 
             # Step 2: Process validated file
             try:
@@ -1,23 +1,66 @@
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 import pandas as pd
 import json
 import os
 from pathlib import Path
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+from ..models.db_models import PlayerDraw, ProcessorState
+from ..utils.db_manager import DatabaseManager
+
+# Scalar state persisted as JSON values in the processor_state table;
+# player history lives in player_draws, one row per player per draw
+STATE_KEYS = ('last_draw_number', 'processed_files', 'draw_mapping')
+
+# Rows per chunk when streaming daily files
+CHUNK_SIZE = 200_000
 
 class DataProcessor:
-    def __init__(self, state_file: str = "processor_state.json"):
+    def __init__(self, state_file: str = "processor_state.json", db_url: Optional[str] = None):
         """
         Initialize the data processor.
         
         Args:
-            state_file: Path to file storing processor state (draw numbers, history)
+            state_file: Path to legacy JSON state file, imported if the database has no state
+            db_url: Database storing processor state (draw numbers, history)
         """
         self.state_file = state_file
+        self.db = DatabaseManager.get(db_url)
+        # One session for the processor's lifetime, one transaction per file
+        self.session = self.db.get_session()
         self.state = self._load_state()
+        self.participation_masks = self._build_participation_masks()
         
     def _load_state(self) -> Dict:
-        """Load or initialize processor state."""
+        """Load processor state from the database, importing the state file on first run."""
+        session = self.session
+        try:
+            state = {row.key: json.loads(row.value) for row in session.query(ProcessorState)}
+            if not all(key in state for key in STATE_KEYS):
+                state = self._load_state_file()
+                self._write_state(session, state, [
+                    {'mobile': mobile, 'draw_number': int(draw), 'tickets': tickets}
+                    for mobile, history in state['player_history'].items()
+                    for draw, tickets in history['tickets'].items()
+                ])
+                session.commit()
+                return state
+
+            player_history = {}
+            for mobile, draw_number, tickets in session.query(
+                PlayerDraw.mobile, PlayerDraw.draw_number, PlayerDraw.tickets
+            ):
+                history = player_history.setdefault(mobile, {'participation': {}, 'tickets': {}})
+                history['participation'][str(draw_number)] = True
+                history['tickets'][str(draw_number)] = tickets
+            state['player_history'] = player_history
+            return state
+        finally:
+            session.rollback()  # End the read transaction
+
+    def _load_state_file(self) -> Dict:
+        """Load or initialize processor state from the legacy JSON state file."""
         try:
             if os.path.exists(self.state_file):
                 with open(self.state_file, 'r') as f:
@@ -42,64 +85,43 @@ class DataProcessor:
             'player_history': {},     # Store player participation history
             'draw_mapping': {}        # Map draw_ids to D-numbers
         }
+
+    def _write_state(self, session: Session, state: Dict, player_draws: List[Dict]):
+        """Stage state counters and new player draw rows on the session."""
+        for key in STATE_KEYS:
+            session.merge(ProcessorState(key=key, value=json.dumps(state[key])))
+        if player_draws:
+            session.bulk_insert_mappings(PlayerDraw, player_draws)
     
-    def _save_state(self):
-        """Save current state to file with backup."""
-        # Create backup of existing state file
-        if os.path.exists(self.state_file):
-            backup_file = f"{self.state_file}.bak"
-            try:
-                import shutil
-                shutil.copy2(self.state_file, backup_file)
-            except IOError as e:
-                print(f"Warning: Could not create backup file ({str(e)})")
-    
-        # Convert all integer keys to strings before saving
-        if 'player_history' in self.state:
-            for player in self.state['player_history']:
-                if 'participation' in self.state['player_history'][player]:
-                    self.state['player_history'][player]['participation'] = {
-                        str(k): v for k, v in 
-                        self.state['player_history'][player]['participation'].items()
-                    }
-                if 'tickets' in self.state['player_history'][player]:
-                    self.state['player_history'][player]['tickets'] = {
-                        str(k): v for k, v in 
-                        self.state['player_history'][player]['tickets'].items()
-                    }
-        
-        if 'draw_mapping' in self.state:
-            self.state['draw_mapping'] = {
-                str(k): v for k, v in self.state['draw_mapping'].items()
-            }
-    
-        # Save new state
+    def _save_state(self, draw_mapping: Dict[str, int], player_mobiles: Iterable[str]):
+        """Save the draws added by the current file, in a single transaction."""
+        player_draws = []
+        for player_mobile in player_mobiles:
+            tickets = self.state['player_history'][player_mobile]['tickets']
+            for draw_number in draw_mapping.values():
+                if str(draw_number) in tickets:
+                    player_draws.append({
+                        'mobile': player_mobile,
+                        'draw_number': draw_number,
+                        'tickets': tickets[str(draw_number)]
+                    })
+
         try:
-            with open(self.state_file, 'w') as f:
-                json.dump(self.state, f, indent=2)
-        except IOError as e:
-            print(f"Error saving state file: {str(e)}")
-            if os.path.exists(f"{self.state_file}.bak"):
-                print("Attempting to restore from backup...")
-                import shutil
-                shutil.copy2(f"{self.state_file}.bak", self.state_file)    
+            self._write_state(self.session, self.state, player_draws)
+            self.session.commit()
+        except SQLAlchemyError as e:
+            self.session.rollback()
+            print(f"Error saving processor state: {str(e)}")
 
 
-    def _assign_draw_numbers(self, daily_data: pd.DataFrame) -> Dict[str, int]:
+    def _assign_draw_numbers(self, draw_ids: Iterable[str]) -> Dict[str, int]:
         """
         Assign D-numbers to new draws.
         Returns mapping of draw_ids to D-numbers.
         """
-        draw_ids = daily_data['DRAW_ID'].unique()
         draw_mapping = {}
         
         for draw_id in sorted(draw_ids):
-            # Get draw times for this draw_id to determine sequence
-            draw_times = pd.to_datetime(
-                daily_data[daily_data['DRAW_ID'] == draw_id]['CREATED'],
-                format='%d/%m/%Y %H:%M'
-            )
-            mean_hour = draw_times.dt.hour.mean()
             
             # Increment draw number
             self.state['last_draw_number'] += 1
@@ -111,7 +133,7 @@ class DataProcessor:
         
         return draw_mapping
 
-    def _calculate_e_score(self, player_mobile: str, daily_data: pd.DataFrame) -> int:
+    def _calculate_e_score(self, player_mobile: str) -> int:
         """Calculate total tickets bought by player."""
         player_history = self.state['player_history'].get(player_mobile, {})
         # Only need to sum tickets from history since they include current tickets
@@ -120,24 +142,40 @@ class DataProcessor:
         return total_tickets        
 
 
-    def _calculate_segment(self, player_mobile: str) -> str:
+    def _build_participation_masks(self) -> Dict[str, int]:
+        """Encode each player's participation as an int bitmask (bit n set = played D<n>)."""
+        masks = {}
+        for player_mobile, player_history in self.state['player_history'].items():
+            mask = 0
+            for draw_number in player_history.get('participation', {}):
+                mask |= 1 << int(draw_number)
+            masks[player_mobile] = mask
+        return masks
+
+    def _get_recent_draws(self) -> List[int]:
+        """Get the last 8 draw numbers (4 cycles, 2 draws per day)."""
+        return sorted(int(d) for d in self.state['draw_mapping'].values())[-8:]
+
+    def _participation_window(self, player_mobile: str, recent_draws: List[int]) -> int:
+        """
+        Participation bits for recent_draws, oldest draw in bit 0.
+        Draw numbers are assigned consecutively, so the window is one shift and mask.
+        """
+        mask = self.participation_masks.get(player_mobile, 0)
+        return (mask >> recent_draws[0]) & ((1 << len(recent_draws)) - 1)
+
+    def _calculate_segment(self, player_mobile: str, recent_draws: List[int]) -> str:
         """Calculate player segment (A-E) based on last 4 draw cycles."""
-        player_history = self.state['player_history'].get(player_mobile, {})
-        
-        # Get last 8 draws (4 cycles, 2 draws per day)
-        recent_draws = sorted(
-            [int(d) for d in self.state['draw_mapping'].values()]
-        )[-8:]
         if not recent_draws:
             return 'E'  # Default for new players
-            
-        # Count cycles with participation
-        cycles_with_participation = 0
-        for i in range(0, len(recent_draws), 2):
-            cycle_draws = recent_draws[i:i+2]
-            if any(str(d) in player_history.get('participation', {}) 
-                  for d in cycle_draws):
-                cycles_with_participation += 1
+
+        window = self._participation_window(player_mobile, recent_draws)
+
+        # Count cycles (draw pairs) with participation
+        cycles_with_participation = (
+            ((window & 0b11) != 0) + ((window >> 2 & 0b11) != 0) +
+            ((window >> 4 & 0b11) != 0) + ((window >> 6 & 0b11) != 0)
+        )
         
         # Determine segment
         if cycles_with_participation == 4:
@@ -151,91 +189,99 @@ class DataProcessor:
         else:
             return 'E'
 
-    def _calculate_gear(self, player_mobile: str) -> int:
+    def _calculate_gear(self, player_mobile: str, recent_draws: List[int]) -> int:
         """Calculate gear (missed draws in last 4 cycles)."""
-        player_history = self.state['player_history'].get(player_mobile, {})
-        recent_draws = sorted(
-            [int(d) for d in self.state['draw_mapping'].values()]
-        )[-8:]
-        
         if not recent_draws:
             return 4  # Default for new players
-            
+
+        window = self._participation_window(player_mobile, recent_draws)
+
         # Count missed draws
-        missed_draws = 0
-        for draw in recent_draws:
-            if str(draw) not in player_history.get('participation', {}):
-                missed_draws += 1
+        missed_draws = len(recent_draws) - bin(window).count('1')
                 
         return min(4, missed_draws)  # Cap at 4
 
-    def _update_player_history(self, daily_data: pd.DataFrame, draw_mapping: Dict[str, int]):
-        """Update player participation history."""
-        for player_mobile in daily_data['PLAYER_MOBILE'].unique():
-            if player_mobile not in self.state['player_history']:
-                self.state['player_history'][player_mobile] = {
-                    'participation': {},
-                    'tickets': {}
-                }
-            
-            player_data = daily_data[daily_data['PLAYER_MOBILE'] == player_mobile]
-            player_history = self.state['player_history'][player_mobile]
-            
-            for draw_id in player_data['DRAW_ID'].unique():
-                # Convert draw_number to str explicitly when using as dict key
-                draw_number = str(draw_mapping[str(draw_id)])  # Add str() here
-                tickets_in_draw = len(player_data[player_data['DRAW_ID'] == draw_id])
-                
-                # Use string keys
-                player_history['participation'][draw_number] = True
-                player_history['tickets'][draw_number] = tickets_in_draw
+    def _update_player_history(self, ticket_counts: pd.Series, draw_mapping: Dict[str, int]):
+        """Update player participation history from per (player, draw) ticket counts."""
+        for (player_mobile, draw_id), tickets_in_draw in ticket_counts.items():
+            player_history = self.state['player_history'].setdefault(
+                player_mobile, {'participation': {}, 'tickets': {}}
+            )
 
+            # Convert draw_number to str explicitly when using as dict key
+            draw_number = str(draw_mapping[str(draw_id)])
 
+            # Use string keys
+            player_history['participation'][draw_number] = True
+            player_history['tickets'][draw_number] = int(tickets_in_draw)
+
+            # Keep the participation bitmask in step with the history
+            self.participation_masks[player_mobile] = (
+                self.participation_masks.get(player_mobile, 0) | 1 << int(draw_number)
+            )
+
+
+
+    def _read_daily_file(self, file_path: str) -> Tuple[pd.Series, pd.DataFrame]:
+        """
+        Stream a daily file in chunks, keeping only per-player aggregates.
+        Returns ticket counts per (PLAYER_MOBILE, DRAW_ID) and each player's
+        first row, both in order of first appearance in the file.
+        """
+        chunk_counts = []
+        chunk_first_rows = []
+        # Read all columns as strings: skips type inference and keeps
+        # PLAYER_MOBILE/DRAW_ID as the string keys used in state
+        for chunk in pd.read_csv(file_path, dtype=str, chunksize=CHUNK_SIZE):
+            chunk_counts.append(
+                chunk.groupby(['PLAYER_MOBILE', 'DRAW_ID'], sort=False).size()
+            )
+            chunk_first_rows.append(chunk.drop_duplicates('PLAYER_MOBILE', keep='first'))
+
+        # Combine chunks; a player or draw may span several of them
+        ticket_counts = pd.concat(chunk_counts).groupby(level=[0, 1], sort=False).sum()
+        first_rows = pd.concat(chunk_first_rows).drop_duplicates('PLAYER_MOBILE', keep='first')
+        return ticket_counts, first_rows
 
     def process_daily_file(self, file_path: str) -> pd.DataFrame:
         """
         Process a daily file and update consolidated view.
         """
         # Read and prepare daily data
+        ticket_counts, first_rows = self._read_daily_file(file_path)
         
-        daily_data = pd.read_csv(file_path)
-        # Add this line to convert PLAYER_MOBILE to string
-        daily_data['PLAYER_MOBILE'] = daily_data['PLAYER_MOBILE'].astype(str)
-        # print("\nDEBUG INFO:")
-        # print("Column types:", daily_data.dtypes)
-        # print("\nSample DRAW_ID:", daily_data['DRAW_ID'].iloc[0], "Type:", type(daily_data['DRAW_ID'].iloc[0]))
-        # print("\nFirst few rows of DRAW_ID:")
-        # print(daily_data['DRAW_ID'].head())        
-
-        daily_data['CREATED_DT'] = pd.to_datetime(
-            daily_data['CREATED'], 
+        # Check if file was already processed (first row is the file's first row)
+        file_date = pd.to_datetime(
+            first_rows['CREATED'].iloc[0], 
             format='%d/%m/%Y %H:%M'
-        )
-        
-        # Check if file was already processed
-        file_date = daily_data['CREATED_DT'].dt.date.iloc[0]
+        ).date()
         if str(file_date) in self.state['processed_files']:
             raise ValueError(f"File for date {file_date} already processed")
             
         # Assign D-numbers to draws
-        draw_mapping = self._assign_draw_numbers(daily_data)
+        draw_mapping = self._assign_draw_numbers(
+            ticket_counts.index.unique(level='DRAW_ID')
+        )
         
         # Update player history
-        self._update_player_history(daily_data, draw_mapping)
+        self._update_player_history(ticket_counts, draw_mapping)
+
+        # Draw window shared by every player's segment and gear
+        recent_draws = self._get_recent_draws()
         
         # Create consolidated records
         consolidated_records = []
-        for player_mobile in daily_data['PLAYER_MOBILE'].unique():
-            player_data = daily_data[daily_data['PLAYER_MOBILE'] == player_mobile].iloc[0]
+        for player_data in first_rows.itertuples(index=False):
+            player_mobile = player_data.PLAYER_MOBILE
             
-            player_name = player_data['PLAYER_NAME'].split()
+            player_name = player_data.PLAYER_NAME.split()
             last_name = player_name[0]
             other_names = ' '.join(player_name[1:])
             
             # Calculate metrics
-            e_score = self._calculate_e_score(player_mobile, daily_data)
-            segment = self._calculate_segment(player_mobile)
-            gear = self._calculate_gear(player_mobile)
+            e_score = self._calculate_e_score(player_mobile)
+            segment = self._calculate_segment(player_mobile, recent_draws)
+            gear = self._calculate_gear(player_mobile, recent_draws)
             
             # Create base record
             record = {
@@ -243,26 +289,41 @@ class DataProcessor:
                 'OTHER_NAMES': other_names,
                 'MOBILE': player_mobile,
                 'PROMOTIONAL_CONSENT': 'Y',  # This should come from player profile
-                'CREATED': player_data['CREATED'],
+                'CREATED': player_data.CREATED,
                 'E-Score': e_score,
                 'Indicative Segment': segment,
                 'Gear': gear
             }
             
-            # Add draw columns
-            player_history = self.state['player_history'][player_mobile]
-            for d_number in range(301, self.state['last_draw_number'] + 1):
-                col_name = f'D{d_number}'
-                record[col_name] = player_history['tickets'].get(str(d_number), 0)
-            
             consolidated_records.append(record)
         
         # Create consolidated DataFrame
         consolidated_df = pd.DataFrame(consolidated_records)
         
+        # Add draw columns: one D-column per draw, tickets per player
+        player_mobiles = consolidated_df['MOBILE']
+        draw_numbers = range(301, self.state['last_draw_number'] + 1)
+        player_draws = pd.DataFrame(
+            [
+                (player_mobile, int(d_number), tickets)
+                for player_mobile in player_mobiles
+                for d_number, tickets in self.state['player_history'][player_mobile]['tickets'].items()
+            ],
+            columns=['MOBILE', 'DRAW_NUMBER', 'TICKETS']
+        )
+        draw_columns = (
+            player_draws.set_index(['MOBILE', 'DRAW_NUMBER'])['TICKETS']
+            .unstack(fill_value=0)
+            .reindex(index=player_mobiles, columns=draw_numbers, fill_value=0)
+        )
+        draw_columns.columns = [f'D{d_number}' for d_number in draw_numbers]
+        consolidated_df = pd.concat(
+            [consolidated_df, draw_columns.reset_index(drop=True)], axis=1
+        )
+        
         # Update state
         self.state['processed_files'].append(str(file_date))
-        self._save_state()
+        self._save_state(draw_mapping, player_mobiles)
         
         return consolidated_df
 
@@ -271,7 +332,7 @@ if __name__ == "__main__":
     import sys
     
     if len(sys.argv) != 2:
-        print("Usage: python data_processor.py <path_to_daily_file>")
+        print("Usage: python -m src.processors.data_processor <path_to_daily_file>")
         sys.exit(1)
         
     processor = DataProcessor()
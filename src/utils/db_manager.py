@@ -1,22 +1,66 @@
 # src/utils/db_manager.py
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.orm import Session
 from ..models.db_models import Base
 from pathlib import Path
+from typing import Dict, Optional
 import logging
 
+# Connection settings for bulk daily loads: WAL journal, one fsync per
+# commit instead of per write, temp tables in memory, 64MB page cache
+# and 256MB memory-mapped I/O.
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+    "PRAGMA mmap_size=268435456",
+)
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record):
+    """Apply SQLITE_PRAGMAS to each new SQLite connection."""
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 class DatabaseManager:
+    # Shared managers keyed by database URL, see get()
+    _instances: Dict[str, 'DatabaseManager'] = {}
+    
     def __init__(self, db_url: str = None):
+        db_url = self._resolve_url(db_url)
+        
+        if db_url.startswith('sqlite'):
+            # The file watcher handles events on the observer thread
+            self.engine = create_engine(
+                db_url, connect_args={"check_same_thread": False}
+            )
+            event.listen(self.engine, "connect", _set_sqlite_pragmas)
+        else:
+            self.engine = create_engine(db_url)
+        self.SessionLocal = sessionmaker(bind=self.engine)
+        
+    @staticmethod
+    def _resolve_url(db_url: Optional[str]) -> str:
+        """Return db_url, defaulting to the SQLite database in src directory"""
         if db_url is None:
-            # Default to SQLite database in src directory
             src_dir = Path(__file__).parent.parent
             db_path = src_dir / 'lottery.db'
             db_url = f'sqlite:///{db_path}'
+        return db_url
         
-        self.engine = create_engine(db_url)
-        self.SessionLocal = sessionmaker(bind=self.engine)
+    @classmethod
+    def get(cls, db_url: str = None) -> 'DatabaseManager':
+        """Get the shared, initialized manager for db_url, creating it on first use"""
+        db_url = cls._resolve_url(db_url)
+        if db_url not in cls._instances:
+            manager = cls(db_url)
+            manager.init_db()
+            cls._instances[db_url] = manager
+        return cls._instances[db_url]
         
     def init_db(self):
         """Initialize database tables"""
@@ -1,7 +1,58 @@
-from datetime import datetime
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime
+from functools import partial
+import re
 from typing import List, Dict, Optional
+import numpy as np
 import pandas as pd
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+
+# Format patterns, compiled once at import. [0-9] rather than \d keeps the
+# digit classes ASCII-only without passing re flags through pandas.
+_TICKET_RE = re.compile(r'^787-[0-9]{9}[A-Z]$')
+_MOBILE_RE = re.compile(r'^233[0-9]{9}$')
+_PRICE_RE = re.compile(r'^GHS [0-9]+\.[0-9]{2}$')
+
+# Rows per chunk when streaming daily files
+CHUNK_SIZE = 200_000
+
+# Byte -> character class lookup (1 = digit, 2 = uppercase letter, 0 = other)
+# for the fixed-width ticket check, see _is_ticket()
+_CHAR_CLASS = np.zeros(256, dtype=np.uint8)
+_CHAR_CLASS[ord('0'):ord('9') + 1] = 1
+_CHAR_CLASS[ord('A'):ord('Z') + 1] = 2
+_TICKET_PREFIX = np.array([ord(c) for c in '787-'], dtype=np.uint32)
+_TICKET_CLASSES = np.array([1] * 9 + [2], dtype=np.uint8)
+
+def _first_values(column: pd.Series, mask, limit: int = 5) -> List:
+    """Return up to `limit` values of column where mask (Series or array) is True, in row order."""
+    positions = np.flatnonzero(np.asarray(mask))[:limit]
+    return column.iloc[positions].tolist()
+
+def _is_ticket(column: pd.Series) -> np.ndarray:
+    """
+    Table-driven equivalent of _TICKET_RE for every row.
+    Tickets are unique, so this replaces the regex rather than deduplicating.
+    """
+    # One fixed-width row of code points per value; longer values spill into
+    # the 15th slot and missing values become 'nan', so both fail below
+    chars = column.to_numpy(dtype='U15').view(np.uint32).reshape(len(column), 15)
+    classes = _CHAR_CLASS[np.minimum(chars[:, 4:14], 255)]
+    return (
+        (chars[:, :4] == _TICKET_PREFIX).all(axis=1) &
+        (classes == _TICKET_CLASSES).all(axis=1) &
+        (chars[:, 14] == 0)
+    )
+
+def _match_distinct(column: pd.Series, pattern: re.Pattern) -> np.ndarray:
+    """
+    Match pattern against each distinct value once and broadcast back to rows.
+    For low-cardinality columns; missing values never match.
+    """
+    codes, uniques = pd.factorize(column)
+    matched = pd.Series(uniques).str.match(pattern, na=False).to_numpy()
+    # factorize codes missing values as -1, which picks the trailing False
+    return np.append(matched, False)[codes]
 
 @dataclass
 class ValidationError:
@@ -14,6 +65,28 @@ class ValidationResult:
     is_valid: bool
     errors: List[ValidationError]
     data: Optional[pd.DataFrame] = None
+    num_records: int = 0
+
+@dataclass
+class _FileTotals:
+    """Running aggregates for one file, updated a chunk at a time."""
+    num_records: int = 0
+    null_counts: Dict[str, int] = field(default_factory=dict)
+    # First invalid values per details key, in file order
+    samples: Dict[str, List] = field(default_factory=dict)
+    file_date: Optional[date] = None
+    date_error: Optional[str] = None
+    # Tickets seen so far, only tracked until duplicate_tickets is full
+    seen_tickets: set = field(default_factory=set)
+    duplicate_tickets: List[str] = field(default_factory=list)
+    # Per-chunk min/max hour and in-window flag by draw
+    draw_windows: List[pd.DataFrame] = field(default_factory=list)
+
+    def add_samples(self, key: str, column: pd.Series, mask, limit: int = 5) -> None:
+        """Keep the first `limit` values of column where mask is True."""
+        sample = self.samples.setdefault(key, [])
+        if len(sample) < limit:
+            sample.extend(_first_values(column, mask, limit - len(sample)))
 
 class FileValidator:
     """Validates daily ticket files for the lottery system."""
@@ -26,98 +99,131 @@ class FileValidator:
         'PRICE': str,
         'CREATED': str
     }
+    REQUIRED_COLUMN_SET = frozenset(REQUIRED_COLUMNS)
 
-    TICKET_PATTERN = r'^787-\d{9}[A-Z]$'
-    MOBILE_PATTERN = r'^233\d{9}$'
-    PRICE_PATTERN = r'^GHS \d+\.\d{2}$'
-    
-    def __init__(self):
-        self.errors = []
+    TICKET_PATTERN = _TICKET_RE.pattern
+    MOBILE_PATTERN = _MOBILE_RE.pattern
+    PRICE_PATTERN = _PRICE_RE.pattern
 
-    def validate_file(self, file_path: str) -> ValidationResult:
+    def validate_file(self, file_path: str, return_data: bool = True) -> ValidationResult:
         """
         Main validation method for daily ticket files.
+        The file is checked CHUNK_SIZE rows at a time; rows are only kept in
+        memory when return_data is set.
         Returns ValidationResult with status and any errors found.
         """
         try:
-            # Read CSV file with all columns as string type
-            df = pd.read_csv(file_path, dtype=str)
-            
-            # Trim whitespace from all string columns
-            for col in df.columns:
-                df[col] = df[col].str.strip()
-            
-            # Run all validations
-            self._validate_schema(df)
-            if not self.errors:  # Only continue if schema is valid
-                self._validate_data_types(df)
-                self._validate_business_rules(df)
-            
-            is_valid = len(self.errors) == 0
+            totals = _FileTotals()
+            chunks = []
+            # Read only the required columns, all as string type. A callable
+            # usecols skips missing names instead of raising, so they are
+            # still reported by the schema check below.
+            with pd.read_csv(
+                file_path,
+                dtype=str,
+                usecols=self.REQUIRED_COLUMN_SET.__contains__,
+                chunksize=CHUNK_SIZE
+            ) as reader:
+                for df in reader:
+                    # Trim whitespace from all string columns
+                    for col in df.columns:
+                        df[col] = df[col].str.strip()
+
+                    # Only continue if schema is valid
+                    schema_errors = self._validate_schema(df)
+                    if schema_errors:
+                        return ValidationResult(is_valid=False, errors=schema_errors)
+
+                    totals.num_records += len(df)
+                    self._validate_data_types(df, totals)
+                    self._validate_business_rules(df, totals)
+                    if return_data:
+                        chunks.append(df)
+
+            errors = self._data_type_errors(totals) + self._business_rule_errors(totals)
+            is_valid = len(errors) == 0
             return ValidationResult(
                 is_valid=is_valid,
-                errors=self.errors,
-                data=df if is_valid else None
+                errors=errors,
+                data=pd.concat(chunks) if is_valid and return_data else None,
+                num_records=totals.num_records
             )
 
         except Exception as e:
-            self.errors.append(ValidationError(
+            return ValidationResult(is_valid=False, errors=[ValidationError(
                 error_type="FILE_ERROR",
                 message=f"Error reading file: {str(e)}"
-            ))
-            return ValidationResult(is_valid=False, errors=self.errors)
+            )])
+
+    def validate_many(self, file_paths: List[str], workers: Optional[int] = None,
+                      return_data: bool = True) -> Dict[str, ValidationResult]:
+        """
+        Validate several daily files, one file per worker process.
+        Returns a ValidationResult for each path, keyed by path.
+        """
+        validate = partial(self.validate_file, return_data=return_data)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = executor.map(validate, file_paths, chunksize=4)
+            return dict(zip(file_paths, results))
 
-    def _validate_schema(self, df: pd.DataFrame) -> None:
+    def _validate_schema(self, df: pd.DataFrame) -> List[ValidationError]:
         """Validate the presence and names of required columns."""
-        missing_columns = set(self.REQUIRED_COLUMNS.keys()) - set(df.columns)
+        errors = []
+        missing_columns = self.REQUIRED_COLUMN_SET.difference(df.columns)
         if missing_columns:
-            self.errors.append(ValidationError(
+            errors.append(ValidationError(
                 error_type="SCHEMA_ERROR",
                 message="Missing required columns",
                 details={"missing_columns": list(missing_columns)}
             ))
+        return errors
 
-    def _validate_data_types(self, df: pd.DataFrame) -> None:
-        """Validate data types and formats of all columns."""
-        # Check for null values
-        null_counts = df.isnull().sum()
-        columns_with_nulls = null_counts[null_counts > 0]
-        if not columns_with_nulls.empty:
-            self.errors.append(ValidationError(
-                error_type="DATA_ERROR",
-                message="Null values found in data",
-                details={"columns": columns_with_nulls.to_dict()}
-            ))
+    def _validate_data_types(self, df: pd.DataFrame, totals: _FileTotals) -> None:
+        """Check data types and formats of one chunk, adding to totals."""
+        # Count null values, one column mask at a time
+        for col in df.columns:
+            totals.null_counts[col] = totals.null_counts.get(col, 0) + int(df[col].isna().sum())
 
         # Validate ticket format
-        invalid_tickets = df[~df['TICKET'].astype(str).str.match(self.TICKET_PATTERN)]
-        if not invalid_tickets.empty:
-            self.errors.append(ValidationError(
-                error_type="FORMAT_ERROR",
-                message="Invalid ticket number format",
-                details={"invalid_tickets": invalid_tickets['TICKET'].tolist()[:5]}
-            ))
+        totals.add_samples("invalid_tickets", df['TICKET'], ~_is_ticket(df['TICKET']))
 
-        # Validate mobile number format
-        invalid_mobiles = df[~df['PLAYER_MOBILE'].astype(str).str.match(self.MOBILE_PATTERN)]
-        if not invalid_mobiles.empty:
-            self.errors.append(ValidationError(
-                error_type="FORMAT_ERROR",
-                message="Invalid mobile number format",
-                details={"invalid_mobiles": invalid_mobiles['PLAYER_MOBILE'].tolist()[:5]}
-            ))
+        # Validate mobile number format (a few hundred players per file)
+        totals.add_samples(
+            "invalid_mobiles", df['PLAYER_MOBILE'], ~_match_distinct(df['PLAYER_MOBILE'], _MOBILE_RE)
+        )
+
+        # Validate price format (usually a single price per file)
+        totals.add_samples("invalid_prices", df['PRICE'], ~_match_distinct(df['PRICE'], _PRICE_RE))
 
-        # Validate price format
-        invalid_prices = df[~df['PRICE'].astype(str).str.match(self.PRICE_PATTERN)]
-        if not invalid_prices.empty:
-            self.errors.append(ValidationError(
-                error_type="FORMAT_ERROR",
-                message="Invalid price format",
-                details={"invalid_prices": invalid_prices['PRICE'].tolist()[:5]}
+    def _data_type_errors(self, totals: _FileTotals) -> List[ValidationError]:
+        """Data type and format errors for the whole file."""
+        errors = []
+        columns_with_nulls = {col: count for col, count in totals.null_counts.items() if count}
+        if columns_with_nulls:
+            errors.append(ValidationError(
+                error_type="DATA_ERROR",
+                message="Null values found in data",
+                details={"columns": columns_with_nulls}
             ))
 
-    def _validate_business_rules(self, df: pd.DataFrame) -> None:
-        """Validate business rules for the daily ticket file."""
+        for key, message in (
+            ("invalid_tickets", "Invalid ticket number format"),
+            ("invalid_mobiles", "Invalid mobile number format"),
+            ("invalid_prices", "Invalid price format"),
+        ):
+            if totals.samples.get(key):
+                errors.append(ValidationError(
+                    error_type="FORMAT_ERROR",
+                    message=message,
+                    details={key: totals.samples[key]}
+                ))
+        return errors
+
+    def _validate_business_rules(self, df: pd.DataFrame, totals: _FileTotals) -> None:
+        """Check business rules on one chunk, adding to totals."""
+        if totals.date_error is not None:
+            return  # Stop further validation if dates are invalid
+
         # Convert CREATED to datetime
         try:
             df['CREATED_DT'] = pd.to_datetime(
@@ -125,89 +231,130 @@ class FileValidator:
                 format='%d/%m/%Y %H:%M'
             )
         except Exception as e:
-            self.errors.append(ValidationError(
+            totals.date_error = str(e)
+            return
+
+        # Check for duplicate tickets (repeat occurrences only, one hash pass),
+        # including repeats of tickets from earlier chunks
+        if len(totals.duplicate_tickets) < 5:
+            tickets = df['TICKET']
+            repeats = tickets.duplicated()
+            if totals.seen_tickets:
+                repeats |= tickets.isin(totals.seen_tickets)
+            for ticket in tickets[repeats].unique():
+                if ticket not in totals.duplicate_tickets:
+                    totals.duplicate_tickets.append(ticket)
+                    if len(totals.duplicate_tickets) == 5:
+                        break
+            if len(totals.duplicate_tickets) < 5:
+                totals.seen_tickets.update(tickets)
+            else:
+                totals.seen_tickets.clear()
+
+        # Get the date from the first row to validate the file name matches the data
+        if totals.file_date is None:
+            totals.file_date = df['CREATED_DT'].iloc[0].date()
+
+        # Hour range per draw. Dictionary-encode DRAW_ID (about two values
+        # per file) so draws are grouped on small integer codes instead of
+        # hashing every string
+        hours = df['CREATED_DT'].dt.hour
+        # Check if draw times fall within expected windows (afternoon or evening)
+        in_window = hours.between(12, 15) | hours.between(18, 21)
+        draw_ids = df['DRAW_ID'].astype('category')
+        draw_hours = hours.groupby(draw_ids, observed=True)
+        totals.draw_windows.append(pd.DataFrame({
+            'min_time': draw_hours.min(),
+            'max_time': draw_hours.max(),
+            'in_window': in_window.groupby(draw_ids, observed=True).any()
+        }))
+
+        # Check for invalid player names
+        invalid_names = (
+            (df['PLAYER_NAME'].str.len() < 3) |  # Too short
+            (~df['PLAYER_NAME'].str.contains(' ', regex=False))  # No space between names
+        )
+        totals.add_samples("invalid_names", df['PLAYER_NAME'], invalid_names)
+
+    def _business_rule_errors(self, totals: _FileTotals) -> List[ValidationError]:
+        """Business rule errors for the whole file."""
+        errors = []
+        if totals.date_error is not None:
+            errors.append(ValidationError(
                 error_type="DATE_FORMAT_ERROR",
                 message="Invalid date format in CREATED column",
-                details={"error": str(e)}
+                details={"error": totals.date_error}
             ))
-            return  # Stop further validation if dates are invalid
+            return errors
 
-        # Check for duplicate tickets
-        duplicate_tickets = df[df.duplicated('TICKET', keep=False)]
-        if not duplicate_tickets.empty:
-            self.errors.append(ValidationError(
+        if totals.duplicate_tickets:
+            errors.append(ValidationError(
                 error_type="DUPLICATE_ERROR",
                 message="Duplicate ticket numbers found",
-                details={"duplicate_tickets": duplicate_tickets['TICKET'].tolist()[:5]}
+                details={"duplicate_tickets": totals.duplicate_tickets}
             ))
 
-        # Get the date from the first row to validate the file name matches the data
-        file_date = df['CREATED_DT'].dt.date.iloc[0]
-        
-        # Group by DRAW_ID to check draws
-        draws = df.groupby('DRAW_ID')
+        # Combine chunks; a draw may span several of them
+        draw_windows = pd.concat(totals.draw_windows).groupby(level=0, observed=True).agg(
+            {'min_time': 'min', 'max_time': 'max', 'in_window': 'any'}
+        )
+        file_date = totals.file_date
+        draws = draw_windows.index
         if len(draws) != 2:
-            self.errors.append(ValidationError(
+            errors.append(ValidationError(
                 error_type="DRAW_ERROR",
                 message=f"Invalid number of draws for date {file_date}",
                 details={
                     "date": str(file_date),
                     "num_draws": len(draws),
-                    "draw_ids": list(draws.groups.keys())
+                    "draw_ids": draws.tolist()
                 }
             ))
 
-        # For each draw, validate time windows
-        for draw_id, draw_data in draws:
-            draw_times = draw_data['CREATED_DT'].dt.hour
-            min_time = draw_times.min()
-            max_time = draw_times.max()
-            
-            # Check if draw times fall within expected windows
-            is_afternoon = any((12 <= t <= 15) for t in draw_times)
-            is_evening = any((18 <= t <= 21) for t in draw_times)
-            
-            if not (is_afternoon or is_evening):
-                self.errors.append(ValidationError(
-                    error_type="TIME_ERROR",
-                    message=f"Invalid draw time window for draw {draw_id}",
-                    details={
-                        "draw_id": draw_id,
-                        "time_range": f"{min_time}:00 - {max_time}:00"
-                    }
-                ))
+        # Draws with no ticket inside an afternoon or evening window
+        for draw_id, min_time, max_time, _ in draw_windows[~draw_windows['in_window']].itertuples():
+            errors.append(ValidationError(
+                error_type="TIME_ERROR",
+                message=f"Invalid draw time window for draw {draw_id}",
+                details={
+                    "draw_id": draw_id,
+                    "time_range": f"{min_time}:00 - {max_time}:00"
+                }
+            ))
 
-        # Check for invalid player names
-        invalid_names = df[
-            (df['PLAYER_NAME'].str.len() < 3) |  # Too short
-            (~df['PLAYER_NAME'].str.contains(' '))  # No space between names
-        ]
-        if not invalid_names.empty:
-            self.errors.append(ValidationError(
+        if totals.samples.get("invalid_names"):
+            errors.append(ValidationError(
                 error_type="NAME_ERROR",
                 message="Invalid player names found",
-                details={"invalid_names": invalid_names['PLAYER_NAME'].tolist()[:5]}
+                details={"invalid_names": totals.samples["invalid_names"]}
             ))
+        return errors
 
 # Usage Example:
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) != 2:
-        print("Usage: python file_validator.py <path_to_csv_file>")
+    if len(sys.argv) < 2:
+        print("Usage: python file_validator.py <path_to_csv_file> [<path_to_csv_file> ...]")
         sys.exit(1)
         
-    file_path = sys.argv[1]
+    file_paths = sys.argv[1:]
     validator = FileValidator()
-    result = validator.validate_file(file_path)
-    
-    if result.is_valid:
-        print("File validation successful!")
-        print(f"Total records: {len(result.data)}")
-        print(f"Unique players: {result.data['PLAYER_MOBILE'].nunique()}")
-        print(f"Total draws: {result.data['DRAW_ID'].nunique()}")
+    if len(file_paths) == 1:
+        results = {file_paths[0]: validator.validate_file(file_paths[0])}
     else:
-        print("Validation errors found:")
-        for error in result.errors:
-            print(f"{error.error_type}: {error.message}")
-            if error.details:
-                print(f"Details: {error.details}")
\ No newline at end of file
+        results = validator.validate_many(file_paths)
+    
+    for file_path, result in results.items():
+        if len(results) > 1:
+            print(f"== {file_path}")
+        if result.is_valid:
+            print("File validation successful!")
+            print(f"Total records: {len(result.data)}")
+            print(f"Unique players: {result.data['PLAYER_MOBILE'].nunique()}")
+            print(f"Total draws: {result.data['DRAW_ID'].nunique()}")
+        else:
+            print("Validation errors found:")
+            for error in result.errors:
+                print(f"{error.error_type}: {error.message}")
+                if error.details:
+                    print(f"Details: {error.details}")
\ No newline at end of file